@@ -10,19 +10,32 @@ Tools:
   - TaskStore (in-memory + JSON persistence)
 Memory:
   - session_id (single user demo)
-  - memory.json keeps daily reflections (long-term memory)
+  - memory.json keeps daily reflections (long-term memory),
+    one JSON object per line
 
 Run:
   python app.py
+  python app.py --batch FILE   (bulk import, one message per line)
 """
 
+import argparse
+import asyncio
+import atexit
+import hashlib
 import json
 import os
-from datetime import date
-from typing import List, Dict, Any
-
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, AsyncIterator
+
+import httpx
+from aiolimiter import AsyncLimiter
+import orjson
 from google import genai
 from google.genai import types as genai_types
+from pydantic import BaseModel
 
 
 # =========  LLM CLIENT SETUP  =========
@@ -31,8 +44,15 @@ def get_client() -> genai.Client:
     """
     Create a Gemini client. It automatically uses GEMINI_API_KEY env var.
     """
-    # If you want to force a specific API version:
-    http_options = genai_types.HttpOptions(api_version="v1")
+    # One pooled HTTP/2 connection is kept alive and shared by all agent
+    # calls, instead of paying a new TLS handshake per request.
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+    http_options = genai_types.HttpOptions(
+        # If you want to force a specific API version:
+        api_version="v1",
+        client_args={"limits": limits, "http2": True},
+        async_client_args={"limits": limits, "http2": True},
+    )
     client = genai.Client(http_options=http_options)
     return client
 
@@ -41,17 +61,108 @@ CLIENT = get_client()
 MODEL_NAME = "gemini-2.5-flash"  # fast + cheap, good for this use case
 
 
-def call_llm(prompt: str) -> str:
+# Cap on requests in flight at once: QPM quota spread over the
+# typical seconds one call takes (Little's law).
+GEMINI_QPM = int(os.getenv("GEMINI_QPM", "500"))
+LLM_CALL_SECONDS = float(os.getenv("GEMINI_CALL_SECONDS", "5"))
+LLM_SEMAPHORE = asyncio.Semaphore(max(1, int(GEMINI_QPM / 60 * LLM_CALL_SECONDS)))
+# Paces call starts to the QPM quota so bursts don't hit 429 errors.
+LLM_LIMITER = AsyncLimiter(max_rate=GEMINI_QPM, time_period=60)
+
+
+def llm_config(response_schema: Any = None) -> genai_types.GenerateContentConfig | None:
     """
-    Helper to call Gemini once with text prompt and get plain text back.
+    With a schema, Gemini returns pure JSON matching it (structured output).
     """
-    response = CLIENT.models.generate_content(
-        model=MODEL_NAME,
-        contents=prompt,
+    if response_schema is None:
+        return None
+    return genai_types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=response_schema,
     )
+
+
+async def acall_llm(prompt: str, response_schema: Any = None) -> Any:
+    """
+    Helper to call Gemini once with text prompt and get plain text back.
+    Async, so several agents can wait on the network at the same time.
+
+    If response_schema is given, returns the parsed objects instead
+    (None if the answer could not be parsed).
+    """
+    async with LLM_SEMAPHORE, LLM_LIMITER:
+        response = await CLIENT.aio.models.generate_content(
+            model=MODEL_NAME,
+            contents=prompt,
+            config=llm_config(response_schema),
+        )
+    if response_schema is not None:
+        return response.parsed
     return response.text
 
 
+async def acall_llm_stream(prompt: str) -> AsyncIterator[str]:
+    """
+    Like acall_llm, but yields text chunks as soon as Gemini sends them.
+    """
+    async with LLM_SEMAPHORE, LLM_LIMITER:
+        async for chunk in await CLIENT.aio.models.generate_content_stream(
+            model=MODEL_NAME,
+            contents=prompt,
+        ):
+            if chunk.text:
+                yield chunk.text
+
+
+async def generate_text(prompt: str, stream: bool = False) -> str:
+    """
+    Returns the full answer text. With stream=True it is also printed
+    to the console piece by piece while it is being generated.
+    """
+    if not stream:
+        return await acall_llm(prompt)
+    parts = []
+    async for text in acall_llm_stream(prompt):
+        print(text, end="", flush=True)
+        parts.append(text)
+    print()
+    return "".join(parts)
+
+
+def dumps_compact(obj: Any) -> str:
+    """
+    JSON without indentation or spaces. Used for everything we send to
+    the model: pretty-printing only adds billed input tokens.
+    """
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write the whole file with one write() into a temp file, then swap it in.
+    A crash mid-write leaves the old file intact instead of a broken one.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=1)
+def _date_str_for_day(epoch_day: int) -> str:
+    return str(date(1970, 1, 1) + timedelta(days=epoch_day))
+
+
+def get_today_str() -> str:
+    """
+    Today's date as "YYYY-MM-DD" (local time), formatted once per day.
+    """
+    now = time.time()
+    return _date_str_for_day(int((now + time.localtime(now).tm_gmtoff) // 86400))
+
+
 # =========  SIMPLE TASK STORE (TOOL)  =========
 
 class TaskStore:
@@ -63,28 +174,49 @@ class TaskStore:
     def __init__(self, path: str = "tasks.json"):
         self.path = path
         self._tasks: List[Dict[str, Any]] = []
+        # Indexes over self._tasks, so lookups don't scan the whole list
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_status: Dict[str, Dict[int, Dict[str, Any]]] = defaultdict(dict)
         self._next_id = 1
+        self._dirty = False
         self.load()
 
     def load(self) -> None:
         if os.path.exists(self.path):
             try:
-                with open(self.path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self.path, "rb") as f:
+                    data = orjson.loads(f.read())
                     self._tasks = data.get("tasks", [])
                     self._next_id = data.get("next_id", 1)
             except Exception:
                 # If file corrupted, start fresh
                 self._tasks = []
                 self._next_id = 1
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._by_id = {}
+        self._by_status = defaultdict(dict)
+        for t in self._tasks:
+            self._by_id[t["id"]] = t
+            self._by_status[t.get("status")][t["id"]] = t
 
     def save(self) -> None:
         data = {
             "tasks": self._tasks,
             "next_id": self._next_id,
         }
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        write_atomic(self.path, orjson.dumps(data))
+        self._dirty = False
+
+    def flush(self) -> None:
+        """
+        Write to disk only if something changed since the last save.
+        Mutations just mark the store dirty, so adding many tasks
+        costs one file write instead of one per task.
+        """
+        if self._dirty:
+            self.save()
 
     # ----- tool methods -----
 
@@ -96,80 +228,98 @@ class TaskStore:
             "priority": priority,
             "category": category,
             "status": "pending",
-            "created_date": str(date.today()),
+            "created_date": get_today_str(),
         }
         self._tasks.append(task)
+        self._by_id[task["id"]] = task
+        self._by_status[task["status"]][task["id"]] = task
         self._next_id += 1
-        self.save()
+        self._dirty = True
         return task
 
     def list_tasks(self, status: str | None = None) -> List[Dict[str, Any]]:
         if status is None:
             return list(self._tasks)
-        return [t for t in self._tasks if t.get("status") == status]
+        return self.list_by_status(status)
+
+    def list_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """
+        Tasks with the given status, read straight from the status index.
+        Sorted by id (task-list order), since a bucket's own order
+        depends on when tasks changed status.
+        """
+        return sorted(self._by_status[status].values(), key=lambda t: t["id"])
 
     def update_task_status(self, task_id: int, status: str) -> Dict[str, Any] | None:
-        for t in self._tasks:
-            if t["id"] == task_id:
-                t["status"] = status
-                self.save()
-                return t
-        return None
+        t = self._by_id.get(task_id)
+        if t is None:
+            return None
+        if t.get("status") != status:
+            del self._by_status[t.get("status")][task_id]
+            self._by_status[status][task_id] = t
+            t["status"] = status
+            if status == "done":
+                t["completed_date"] = get_today_str()
+            self._dirty = True
+        return t
 
 
 TASK_STORE = TaskStore()
+# Safety net for unsaved changes; also runs after Ctrl+C (KeyboardInterrupt).
+atexit.register(TASK_STORE.flush)
 
 
 # =========  AGENT 1: TASK INTAKE AGENT  =========
 
-def task_intake_agent(user_message: str) -> List[Dict[str, Any]]:
-    """
-    Takes messy user text and turns it into structured tasks.
+class TaskSchema(BaseModel):
+    title: str
+    due: str
+    priority: str
+    category: str
 
-    Returns list of created tasks (with IDs).
-    """
-    print("\n[IntakeAgent] Received:", user_message)
 
-    prompt = f"""
+class MessageTasksSchema(BaseModel):
+    msg_id: int
+    tasks: List[TaskSchema]
+
+
+def build_intake_prompt(user_message: str) -> str:
+    return f"""
 You are a task extraction agent for a personal to-do app.
 
 USER MESSAGE:
 \"\"\"{user_message}\"\"\"
 
-Extract the tasks and return ONLY valid JSON in this format:
-[
-  {{
-    "title": "...",
-    "due": "today | tomorrow | this week | specific date or 'unspecified'",
-    "priority": "high | medium | low",
-    "category": "study | work | personal | health | other"
-  }},
-  ...
-]
+Extract the tasks. For each task give:
+- title: short task title
+- due: today | tomorrow | this week | specific date or 'unspecified'
+- priority: high | medium | low
+- category: study | work | personal | health | other
 
 Rules:
 - If no due date is mentioned, use "unspecified".
 - If the message is not about tasks, return an empty list [].
-- Do NOT include any extra text, only JSON.
 """
-    raw = call_llm(prompt)
 
-    # Try to parse JSON
+
+def parse_intake_response(raw: str) -> List[Dict[str, Any]] | None:
+    """
+    Parse the model's JSON answer into a list of task dicts.
+    Returns None if the answer is not usable.
+    Only needed for batch responses; direct calls get parsed objects back.
+    """
     try:
-        # Some models wrap JSON in markdown code fence, so strip it
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.strip("`")
-            # remove potential "json" language tag
-            cleaned = cleaned.replace("json", "", 1).strip()
-        data = json.loads(cleaned)
+        data = orjson.loads(raw)
         assert isinstance(data, list)
-    except Exception as e:
+    except (orjson.JSONDecodeError, AssertionError) as e:
         print("[IntakeAgent] ERROR parsing JSON from model:", e)
         print("[IntakeAgent] Raw response was:")
         print(raw)
-        return []
+        return None
+    return data
+
 
+def store_tasks(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     created = []
     for t in data:
         title = t.get("title") or "Untitled task"
@@ -178,27 +328,217 @@ Rules:
         category = t.get("category") or "other"
         created_task = TASK_STORE.add_task(title, due, priority, category)
         created.append(created_task)
+    TASK_STORE.flush()
+    return created
+
+
+async def task_intake_agent(user_message: str) -> List[Dict[str, Any]]:
+    """
+    Takes messy user text and turns it into structured tasks.
+
+    Returns list of created tasks (with IDs).
+    """
+    print("\n[IntakeAgent] Received:", user_message)
+
+    tasks = await acall_llm(build_intake_prompt(user_message), response_schema=list[TaskSchema])
+    if tasks is None:
+        print("[IntakeAgent] ERROR: model did not return valid task JSON")
+        return []
+
+    created = store_tasks([t.model_dump() for t in tasks])
+    print(f"[IntakeAgent] Created {len(created)} tasks")
+    return created
+
+
+# More messages than this in one prompt gives little extra gain,
+# so bigger inputs are split into groups sent in parallel.
+MAX_MESSAGES_PER_PROMPT = 8
+
+
+def build_multi_intake_prompt(messages: List[str]) -> str:
+    sections = "\n\n".join(
+        f"### MSG {i}\n\"\"\"{m}\"\"\"" for i, m in enumerate(messages, start=1)
+    )
+    return f"""
+You are a task extraction agent for a personal to-do app.
+
+USER MESSAGES:
+{sections}
+
+For EACH message, return one object with its msg_id (the number after
+"MSG") and the tasks extracted from it. For each task give:
+- title: short task title
+- due: today | tomorrow | this week | specific date or 'unspecified'
+- priority: high | medium | low
+- category: study | work | personal | health | other
+
+Rules:
+- If no due date is mentioned, use "unspecified".
+- If a message is not about tasks, return an empty tasks list for it.
+"""
+
+
+async def _intake_one_prompt(messages: List[str]) -> List[Dict[str, Any]]:
+    results = await acall_llm(
+        build_multi_intake_prompt(messages),
+        response_schema=list[MessageTasksSchema],
+    )
+    if results is None:
+        print("[IntakeAgent] ERROR: model did not return valid task JSON")
+        return []
+    results.sort(key=lambda r: r.msg_id)
+    return store_tasks([t.model_dump() for r in results for t in r.tasks])
+
+
+async def task_intake_agent_multi(messages: List[str]) -> List[Dict[str, Any]]:
+    """
+    Same as task_intake_agent, but for many messages at once.
+    Messages are packed into one prompt (one LLM round-trip); above
+    MAX_MESSAGES_PER_PROMPT they are split into groups run concurrently.
+    """
+    print(f"\n[IntakeAgent] Received {len(messages)} messages")
+
+    groups = [
+        messages[i:i + MAX_MESSAGES_PER_PROMPT]
+        for i in range(0, len(messages), MAX_MESSAGES_PER_PROMPT)
+    ]
+    results = await asyncio.gather(*(_intake_one_prompt(g) for g in groups))
+    created = [t for group_created in results for t in group_created]
+
+    print(f"[IntakeAgent] Created {len(created)} tasks")
+    return created
+
+
+BATCH_POLL_SECONDS = 10
+BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+async def task_intake_agent_batch(messages: List[str]) -> List[Dict[str, Any]]:
+    """
+    Same as task_intake_agent, but for many messages at once.
+    All prompts go to Gemini in ONE batch job (cheaper than N calls),
+    then we wait for the job to finish and store all extracted tasks.
+    Batch jobs can sit in a queue for a while, so this is meant for
+    scripted bulk imports (python app.py --batch FILE) rather than
+    the interactive menu.
+    """
+    print(f"\n[IntakeAgent] Received {len(messages)} messages (batch mode)")
+
+    job = await CLIENT.aio.batches.create(
+        model=MODEL_NAME,
+        src={
+            "inlined_requests": [
+                {
+                    "contents": build_intake_prompt(m),
+                    "config": llm_config(list[TaskSchema]),
+                }
+                for m in messages
+            ]
+        },
+        config={"display_name": "intake"},
+    )
+    while job.state.name not in BATCH_DONE_STATES:
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        job = await CLIENT.aio.batches.get(name=job.name)
+
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        print(f"[IntakeAgent] Batch job ended with state {job.state.name}:", job.error)
+        return []
+
+    created = []
+    for resp in job.dest.inlined_responses:
+        if resp.error:
+            print("[IntakeAgent] ERROR in batch response:", resp.error)
+            continue
+        data = parse_intake_response(resp.response.text)
+        if data is not None:
+            created.extend(store_tasks(data))
 
     print(f"[IntakeAgent] Created {len(created)} tasks")
     return created
 
 
+# =========  PLAN / REFLECTION CACHE  =========
+
+PLAN_CACHE_FILE = "plan_cache.json"
+
+
+def load_plan_cache() -> Dict[str, str]:
+    if os.path.exists(PLAN_CACHE_FILE):
+        try:
+            with open(PLAN_CACHE_FILE, "rb") as f:
+                return orjson.loads(f.read())
+        except Exception:
+            # If file corrupted, start fresh
+            return {}
+    return {}
+
+
+def prune_plan_cache(cache: Dict[str, str]) -> Dict[str, str]:
+    """
+    Keys carry their date, and entries from other days can never hit
+    again, so only today's entries are kept. This keeps the file small.
+    """
+    today_str = get_today_str()
+    return {k: v for k, v in cache.items() if k.split(":")[1:2] == [today_str]}
+
+
+def save_plan_cache() -> None:
+    global _plan_cache
+    _plan_cache = prune_plan_cache(_plan_cache)
+    write_atomic(PLAN_CACHE_FILE, orjson.dumps(_plan_cache))
+
+
+# Same tasks + same day => same answer, so we skip the LLM call.
+_plan_cache: Dict[str, str] = prune_plan_cache(load_plan_cache())
+
+
+def cache_key(kind: str, today_str: str, payload: str) -> str:
+    return f"{kind}:{today_str}:" + hashlib.sha256(payload.encode()).hexdigest()
+
+
 # =========  AGENT 2: PLANNER AGENT  =========
 
-def planner_agent() -> str:
+RECENT_DONE_DAYS = 7  # done tasks this recent go into the progress summary
+
+
+def task_date(task: Dict[str, Any], today: date, *fields: str) -> date:
     """
-    Reads all tasks and creates a short daily plan.
+    First valid date among the given fields (tasks from older versions
+    may lack some). Falls back to today.
     """
-    all_tasks = TASK_STORE.list_tasks()
-    today_str = str(date.today())
+    for field in fields:
+        try:
+            return date.fromisoformat(task[field])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return today
+
+
+def summarize_done(done: List[Dict[str, Any]]) -> str:
+    if not done:
+        return f"You completed no tasks in the last {RECENT_DONE_DAYS} days."
+    categories = sorted({t.get("category") or "other" for t in done})
+    return (
+        f"You completed {len(done)} tasks in the last {RECENT_DONE_DAYS} days "
+        f"across categories {', '.join(categories)}."
+    )
 
-    prompt = f"""
+
+_PLANNER_TMPL = """
 You are a friendly planning assistant.
 
-TODAY'S DATE: {today_str}
+TODAY'S DATE: {today}
+
+These are the user's pending tasks (JSON):
+{tasks}
 
-These are the user's tasks (JSON):
-{json.dumps(all_tasks, indent=2)}
+Recent progress: {done_summary}
 
 Create a clear plan for today with sections:
 
@@ -211,8 +551,42 @@ Guidelines:
 - Keep the whole plan under 200 words.
 - Use simple English.
 """
-    plan = call_llm(prompt)
+
+
+async def planner_agent(stream: bool = False) -> str:
+    """
+    Creates a short daily plan from the pending tasks.
+    All pending tasks are sent as JSON; recently done tasks are reduced
+    to a one-line summary and older done tasks are left out.
+    With stream=True the plan is printed while it is generated.
+    """
+    today_str = get_today_str()
+    today = date.fromisoformat(today_str)
+
+    actionable = TASK_STORE.list_by_status("pending")
+    recent_done = [
+        t for t in TASK_STORE.list_by_status("done")
+        if (today - task_date(t, today, "completed_date", "created_date")).days <= RECENT_DONE_DAYS
+    ]
+    done_summary = summarize_done(recent_done)
+
+    key = cache_key("plan", today_str, done_summary + json.dumps(actionable, sort_keys=True))
+    if key in _plan_cache:
+        print("[PlannerAgent] Plan loaded from cache.")
+        if stream:
+            print(_plan_cache[key])
+        return _plan_cache[key]
+
+    prompt = _PLANNER_TMPL.format(
+        today=today_str,
+        tasks=dumps_compact(actionable),
+        done_summary=done_summary,
+    )
+    plan = await generate_text(prompt, stream)
     print("[PlannerAgent] Plan generated.")
+
+    _plan_cache[key] = plan
+    save_plan_cache()
     return plan
 
 
@@ -221,40 +595,73 @@ Guidelines:
 MEMORY_FILE = "memory.json"
 
 
-def append_memory(entry: Dict[str, Any]) -> None:
-    memory: List[Dict[str, Any]] = []
-    if os.path.exists(MEMORY_FILE):
-        try:
-            with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-                memory = json.load(f)
-        except Exception:
-            memory = []
-    memory.append(entry)
-    with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(memory, f, indent=2)
+def migrate_memory() -> None:
+    """
+    Runs once at startup.
+    Older versions stored memory.json as one big JSON list; convert it to
+    JSON Lines (one entry per line). If a crash left a torn last line,
+    end it with a newline so new entries start on a clean line.
+    """
+    if not os.path.exists(MEMORY_FILE) or os.path.getsize(MEMORY_FILE) == 0:
+        return
+    with open(MEMORY_FILE, "rb") as f:
+        first = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        if first == b"[":
+            f.seek(0)
+            try:
+                memory = orjson.loads(f.read())
+            except Exception:
+                # If file corrupted, start fresh
+                memory = []
+            write_atomic(MEMORY_FILE, b"".join(orjson.dumps(e) + b"\n" for e in memory))
+            return
+    if last != b"\n":
+        with open(MEMORY_FILE, "ab") as f:
+            f.write(b"\n")
 
 
-# =========  AGENT 3: REFLECTION AGENT  =========
+def append_memory(entry: Dict[str, Any]) -> None:
+    """
+    Appends one line to memory.json, no need to read or rewrite old entries.
+    """
+    with open(MEMORY_FILE, "ab") as f:
+        f.write(orjson.dumps(entry) + b"\n")
+
 
-def reflection_agent() -> str:
+def load_memory() -> Iterator[Dict[str, Any]]:
     """
-    Generates a short reflection based on completed vs pending tasks.
-    Saves reflection into memory.json as "long term memory".
+    Yields memory entries one by one, oldest first.
+    Lines that are not valid JSON (e.g. torn by a crash) are skipped.
     """
-    today_str = str(date.today())
-    completed = [t for t in TASK_STORE.list_tasks() if t["status"] == "done"]
-    pending = [t for t in TASK_STORE.list_tasks() if t["status"] == "pending"]
+    if not os.path.exists(MEMORY_FILE):
+        return
+    with open(MEMORY_FILE, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+
+
+migrate_memory()
+
+
+# =========  AGENT 3: REFLECTION AGENT  =========
 
-    prompt = f"""
+_REFLECTION_TMPL = """
 You are a gentle reflection coach.
 
-Today's date: {today_str}
+Today's date: {today}
 
 Completed tasks:
-{json.dumps(completed, indent=2)}
+{completed}
 
 Pending tasks:
-{json.dumps(pending, indent=2)}
+{pending}
 
 Write a short reflection (3–5 sentences) for the user:
 - Say what they did well.
@@ -262,9 +669,41 @@ Write a short reflection (3–5 sentences) for the user:
 - Give one small suggestion for tomorrow's focus.
 Use very simple English.
 """
-    reflection = call_llm(prompt)
+
+
+async def reflection_agent(stream: bool = False) -> str:
+    """
+    Generates a short reflection based on completed vs pending tasks.
+    Saves reflection into memory.json as "long term memory".
+    With stream=True the reflection is printed while it is generated.
+    """
+    today_str = get_today_str()
+    completed = TASK_STORE.list_by_status("done")
+    pending = TASK_STORE.list_by_status("pending")
+
+    key = cache_key(
+        "reflection",
+        today_str,
+        json.dumps([sorted(t["id"] for t in completed), sorted(t["id"] for t in pending)]),
+    )
+    if key in _plan_cache:
+        # Same state as an earlier reflection today, already in memory.json
+        print("[ReflectionAgent] Reflection loaded from cache.")
+        if stream:
+            print(_plan_cache[key])
+        return _plan_cache[key]
+
+    prompt = _REFLECTION_TMPL.format(
+        today=today_str,
+        completed=dumps_compact(completed),
+        pending=dumps_compact(pending),
+    )
+    reflection = await generate_text(prompt, stream)
     print("[ReflectionAgent] Reflection generated.")
 
+    _plan_cache[key] = reflection
+    save_plan_cache()
+
     # Save to long-term memory
     memory_entry = {
         "date": today_str,
@@ -277,6 +716,32 @@ Use very simple English.
     return reflection
 
 
+# =========  RUN ALL AGENTS  =========
+
+async def run_agents(messages: List[str]) -> Dict[str, Any]:
+    """
+    Runs the whole pipeline for a list of user messages.
+    Intake runs first; planner and reflection then run
+    concurrently on the updated task list.
+    Failed agents show up as exceptions in the result instead of
+    cancelling the others.
+    """
+    try:
+        created = await task_intake_agent_multi(messages)
+    except Exception as e:
+        created = e
+    plan, reflection = await asyncio.gather(
+        planner_agent(),
+        reflection_agent(),
+        return_exceptions=True,
+    )
+    return {
+        "created": created,
+        "plan": plan,
+        "reflection": reflection,
+    }
+
+
 # =========  SIMPLE CLI APP (for demo)  =========
 
 def print_tasks(tasks: List[Dict[str, Any]]) -> None:
@@ -291,7 +756,7 @@ def print_tasks(tasks: List[Dict[str, Any]]) -> None:
         )
 
 
-def main_menu():
+async def main_menu():
     while True:
         print("\n===== SmartToDo – Personal To-Do Agent =====")
         print("1) Add tasks from text (Task Intake Agent)")
@@ -303,8 +768,20 @@ def main_menu():
         choice = input("Choose an option: ").strip()
 
         if choice == "1":
-            user_message = input("\nType your tasks in natural language:\n> ")
-            created = task_intake_agent(user_message)
+            print("\nType your tasks in natural language (blank line to finish):")
+            messages = []
+            while True:
+                line = input("> ").strip()
+                if not line:
+                    break
+                messages.append(line)
+            if not messages:
+                print("No input.")
+                continue
+            if len(messages) == 1:
+                created = await task_intake_agent(messages[0])
+            else:
+                created = await task_intake_agent_multi(messages)
             print("\nCreated tasks:")
             print_tasks(created)
 
@@ -319,6 +796,7 @@ def main_menu():
                 print("Invalid ID.")
                 continue
             updated = TASK_STORE.update_task_status(tid, "done")
+            TASK_STORE.flush()
             if updated:
                 print("Updated task:")
                 print_tasks([updated])
@@ -326,14 +804,12 @@ def main_menu():
                 print("Task not found.")
 
         elif choice == "4":
-            plan = planner_agent()
             print("\n===== PLAN FOR TODAY =====")
-            print(plan)
+            await planner_agent(stream=True)
 
         elif choice == "5":
-            reflection = reflection_agent()
             print("\n===== DAILY REFLECTION =====")
-            print(reflection)
+            await reflection_agent(stream=True)
 
         elif choice == "6":
             print("Bye! 👋")
@@ -343,5 +819,27 @@ def main_menu():
             print("Invalid choice, try again.")
 
 
+def read_messages(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
 if __name__ == "__main__":
-    main_menu()
+    parser = argparse.ArgumentParser(description="SmartToDo – Personal To-Do Agent")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="import tasks from FILE (one message per line) with one Gemini batch job",
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        messages = read_messages(args.batch)
+        if not messages:
+            print("No input.")
+        else:
+            created = asyncio.run(task_intake_agent_batch(messages))
+            print("\nCreated tasks:")
+            print_tasks(created)
+    else:
+        asyncio.run(main_menu())